@@ -73,8 +73,8 @@ def add_response(session, id, data, model):
     if data.subtracted:
         return resp(model)
 
-    bkg_srcs = session._background_sources.get(id, {})
-    if len(bkg_srcs) == 0:
+    bkg_srcs = session._background_sources.get(id)
+    if not bkg_srcs:
         return resp(model)
 
     # At this point we have background one or more background
@@ -2949,7 +2949,8 @@ class DataIMG(Data2D):
 
         # PyRegion objects (of type 'extension') are NOT picklable, yet.
         # preserve the region string and restore later with constructor
-        state['_region'] = state['_region'].__str__()
+        if state['_region'] is not None:
+            state['_region'] = state['_region'].__str__()
         return state
 
     def __setstate__(self, state):
@@ -2966,7 +2967,7 @@ class DataIMG(Data2D):
 
         # _set_coord will correctly define the _get_* WCS function pointers.
         self._set_coord(state['_coord'])
-        if regstatus:
+        if regstatus and self._region is not None:
             self._region = Region(self._region)
         else:
             # An ImportErr could be raised rather than display a
@@ -21,12 +21,13 @@
 """Continued testing of sherpa.astro.data."""
 
 import logging
+import pickle
 
 import numpy as np
 
 import pytest
 
-from sherpa.astro.data import DataPHA
+from sherpa.astro.data import DataIMG, DataPHA
 from sherpa.utils.err import DataErr
 
 
@@ -302,3 +303,23 @@ def test_416_c():
     exp = np.zeros(8)
     exp[3] = 3
     assert dep == pytest.approx(exp)
+
+
+def test_img_pickle_no_region(caplog):
+    """An image with no region filter has no region after pickling.
+
+    The region used to be stored as the string 'None', which was
+    then either parsed as a region or reported as a region that
+    could not be restored.
+    """
+
+    x1, x0 = np.mgrid[1:3, 1:4]
+    y = np.arange(6)
+    img = DataIMG('pickle', x0.flatten(), x1.flatten(), y, shape=(2, 3))
+    assert img._region is None
+
+    restored = pickle.loads(pickle.dumps(img))
+    assert restored._region is None
+    assert restored.get_dep() == pytest.approx(y)
+
+    assert caplog.record_tuples == []
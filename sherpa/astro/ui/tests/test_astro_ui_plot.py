@@ -29,10 +29,15 @@ correct data; it is more a check that the routines can be called.
 
 """
 
+from collections import namedtuple
 import copy
 import logging
+import re
+
 import numpy as np
+from numpy.testing import assert_allclose
 
+import sherpa.plot
 from sherpa.astro import ui
 
 from sherpa.astro.plot import ARFPlot, BkgDataPlot, FluxHistogram, ModelHistogram, \
@@ -44,13 +49,33 @@ from sherpa.utils.testing import requires_data, requires_fits, \
 
 import pytest
 
+try:
+    import matplotlib
+    from matplotlib import pyplot as plt
+    from matplotlib.colors import to_rgba
+
+    # The error-bar line styles changed in matplotlib 3.3. Only the
+    # leading major and minor numbers of the version are compared.
+    _mpl_version = tuple(int(v) for v in
+                         re.findall(r'\d+', matplotlib.__version__)[:2])
+    MPL_33 = _mpl_version >= (3, 3)
 
-_data_chan = np.linspace(1, 10, 10, dtype=np.int8)
+    # The error-bar colors used by the plot option tests.
+    ORANGE = to_rgba('orange')
+    ORANGE_ALPHA = to_rgba('orange', alpha=0.7)
+except ImportError:
+    plt = None
+    MPL_33 = False
+    ORANGE = None
+    ORANGE_ALPHA = None
+
+
+_data_chan = np.arange(1, 11, dtype=np.int32)
 _data_counts = np.asarray([0, 1, 2, 3, 4, 0, 1, 2, 3, 4],
-                          dtype=np.int8)
+                          dtype=np.int32)
 
 _data_bkg = np.asarray([1, 0, 0, 1, 0, 0, 2, 0, 0, 1],
-                       dtype=np.int8)
+                       dtype=np.int32)
 
 _arf = np.asarray([0.8, 0.8, 0.9, 1.0, 1.1, 1.1, 0.7, 0.6, 0.6, 0.6])
 
@@ -60,12 +85,11 @@ _arf = np.asarray([0.8, 0.8, 0.9, 1.0, 1.1, 1.1, 0.7, 0.6, 0.6, 0.6])
 # constant bin width like 0.1 keV the factor of 10 is too easy
 # to confuse for other terms.
 #
-_energies = np.linspace(0.5, 1.5, 11)
 _energies = np.asarray([0.5, 0.65, 0.75, 0.8, 0.9, 1. , 1.1, 1.12, 1.3, 1.4, 1.5])
 _energies_lo = _energies[:-1]
 _energies_hi = _energies[1:]
 _energies_mid = (_energies_lo + _energies_hi) / 2
-_energies_width = _energies_hi - _energies_lo
+_energies_width = np.diff(_energies)
 
 # How much longer is the background exposure compared to the source
 # exposure; chose a non-integer value to make it more obvious when
@@ -74,36 +98,59 @@ _energies_width = _energies_hi - _energies_lo
 #
 _bexpscale = 2.5
 
-# Make sure the arrays can't be changed
-for _array in [_data_chan, _data_counts, _data_bkg, _arf, _energies]:
-    _array.flags.writeable = False
-
-del _array
+# The background rate per channel (the source exposure time is 1201
+# seconds).
+#
+_bkg_rate = _data_bkg / (1201.0 * _bexpscale)
 
 # Normalisation of the models.
 #
 MODEL_NORM = 1.02e2
 BGND_NORM = 0.4
 
+# The expected model values, which do not depend on the dataset
+# identifier. The models are integrated across each energy bin, so
+# the channel values include the bin width but the energy values do
+# not (the model is divided by the bin width when plotted).
+#
+_chan_hi = _data_chan + 1
+_model_y_chan = _arf * MODEL_NORM * _energies_width
+_model_y_energy = _arf * MODEL_NORM
+_bkg_model_y_chan = _arf * BGND_NORM * _energies_width
+_bkg_model_y_energy = _arf * BGND_NORM
+
+# The background residuals (data - model), correcting the counts by
+# the bin width and exposure time.
+#
+_bkg_resid_y_chan = _bkg_rate - _bkg_model_y_chan
+_bkg_resid_y_energy = _bkg_rate / _energies_width - _bkg_model_y_energy
+
+# Make sure the arrays can't be changed
+for _array in [_data_chan, _data_counts, _data_bkg, _arf, _energies,
+               _energies_lo, _energies_hi, _energies_mid, _energies_width,
+               _bkg_rate, _chan_hi, _model_y_chan, _model_y_energy,
+               _bkg_model_y_chan, _bkg_model_y_energy,
+               _bkg_resid_y_chan, _bkg_resid_y_energy]:
+    _array.setflags(write=False)
+
+del _array
+
 
 def example_pha_data():
     """Create an example data set."""
 
     etime = 1201.0
-    d = ui.DataPHA('example', _data_chan.copy(),
-                   _data_counts.copy(),
+    d = ui.DataPHA('example', _data_chan, _data_counts,
                    exposure=etime,
                    backscal=0.2)
 
-    a = ui.create_arf(_energies_lo.copy(),
-                      _energies_hi.copy(),
-                      specresp=_arf.copy(),
+    a = ui.create_arf(_energies_lo, _energies_hi,
+                      specresp=_arf,
                       exposure=etime)
 
-    r = ui.create_rmf(_energies_lo.copy(),
-                      _energies_hi.copy(),
-                      e_min=_energies_lo.copy(),
-                      e_max=_energies_hi.copy(),
+    r = ui.create_rmf(_energies_lo, _energies_hi,
+                      e_min=_energies_lo,
+                      e_max=_energies_hi,
                       startchan=1,
                       fname=None)
 
@@ -112,32 +159,25 @@ def example_pha_data():
     return d
 
 
-def example_pha_with_bkg_data(direct=True):
+def example_pha_with_bkg_data():
     """Create an example data set with background
 
-    There is no response for the background.
+    There is no response for the background, and the background
+    is not associated with the source.
 
-    Parameters
-    ----------
-    direct : bool, optional
-        If True then the background is added to the source
-        and only the source is returned. If False then the
-        return is (source, bgnd) and the background is not
-        associated with the source.
+    Returns
+    -------
+    src, bkg : sherpa.astro.data.DataPHA
+        The source and background datasets.
 
     """
 
     d = example_pha_data()
 
-    b = ui.DataPHA('example-bkg', _data_chan.copy(),
-                   _data_bkg.copy(),
+    b = ui.DataPHA('example-bkg', _data_chan, _data_bkg,
                    exposure=1201.0 * _bexpscale,
                    backscal=0.4)
 
-    if direct:
-        d.set_background(b)
-        return d
-
     return d, b
 
 
@@ -160,7 +200,51 @@ def example_bkg_model():
     return bcpt
 
 
-def setup_example(idval):
+@pytest.fixture(autouse=True)
+def close_figures():
+    """Close any matplotlib figures created by the test.
+
+    The plot tests inspect the current axes, so make sure each test
+    starts from a clean state and the figures are not kept around
+    for the rest of the session.
+    """
+
+    yield
+    if sherpa.plot.backend.name == 'pylab':
+        plt.close('all')
+
+
+@pytest.fixture(scope="session")
+def pha_prototype():
+    """The example source and background datasets.
+
+    The datasets are created once per session, and so must not be
+    changed by a test: use the example_pha fixture to get a version
+    that can be registered with the UI layer.
+
+    Returns
+    -------
+    src, bkg : sherpa.astro.data.DataPHA
+        The source (with ARF and RMF) and background datasets. The
+        background is not associated with the source.
+
+    """
+
+    return example_pha_with_bkg_data()
+
+
+@pytest.fixture
+def example_pha(pha_prototype):
+    """A copy of the example source and background datasets.
+
+    A deep copy is used since the UI layer changes the datasets in
+    place (e.g. set_analysis and set_bkg).
+    """
+
+    return copy.deepcopy(pha_prototype)
+
+
+def setup_example(idval, example):
     """Set up a simple dataset for use in the tests.
 
     A *very basic* ARF is used, along with an ideal RMF. The
@@ -171,13 +255,15 @@ def setup_example(idval):
     ----------
     idval : None, int, str
         The dataset identifier.
+    example : tuple
+        The return value of the example_pha fixture.
 
     See Also
     --------
     setup_example_bkg
     """
 
-    d = example_pha_data()
+    d = example[0]
     m = example_model()
     if idval is None:
         ui.set_data(d)
@@ -188,20 +274,23 @@ def setup_example(idval):
         ui.set_source(idval, m)
 
 
-def setup_example_bkg(idval):
+def setup_example_bkg(idval, example):
     """Set up a simple dataset + background for use in the tests.
 
     Parameters
     ----------
     idval : None, int, str
         The dataset identifier.
+    example : tuple
+        The return value of the example_pha fixture.
 
     See Also
     --------
     setup_example, setup_example_bkg_model
     """
 
-    d = example_pha_with_bkg_data()
+    d, b = example
+    d.set_background(b)
     m = example_model()
     if idval is None:
         ui.set_data(d)
@@ -212,7 +301,7 @@ def setup_example_bkg(idval):
         ui.set_source(idval, m)
 
 
-def setup_example_bkg_model(idval, direct=True):
+def setup_example_bkg_model(idval, example, direct=True):
     """Set up a simple dataset + background for use in the tests.
 
     This includes a model for the background, unlike
@@ -222,31 +311,35 @@ def setup_example_bkg_model(idval, direct=True):
     ----------
     idval : None, int, str
         The dataset identifier.
+    example : tuple
+        The return value of the example_pha fixture.
+    direct : bool, optional
+        If True then the background is added to the source
+        dataset directly, otherwise ui.set_bkg is used.
 
     See Also
     --------
     setup_example_bkg
     """
 
-    d = example_pha_with_bkg_data(direct=direct)
+    d, b = example
+    if direct:
+        d.set_background(b)
+
     m = example_model()
     bm = example_bkg_model()
     if idval is None:
-        if direct:
-            ui.set_data(d)
-        else:
-            ui.set_data(d[0])
-            ui.set_bkg(d[1])
+        ui.set_data(d)
+        if not direct:
+            ui.set_bkg(b)
 
         ui.set_source(m)
         ui.set_bkg_model(bm)
 
     else:
-        if direct:
-            ui.set_data(idval, d)
-        else:
-            ui.set_data(idval, d[0])
-            ui.set_bkg(idval, d[1])
+        ui.set_data(idval, d)
+        if not direct:
+            ui.set_bkg(idval, b)
         ui.set_source(idval, m)
         ui.set_bkg_model(idval, bm)
 
@@ -292,12 +385,25 @@ get_source_plot              X
 """
 
 
-@pytest.mark.parametrize("idval", [None, 1, "one", 23])
-def test_get_arf_plot(idval, clean_astro_ui):
+@pytest.mark.parametrize("idval", [1, "one", 23])
+def test_idval_types(idval, clean_astro_ui, example_pha):
+    """Check the different identifier types are supported.
+
+    The other tests only use the default identifier and 1, since
+    the code paths do not depend on the identifier type.
+    """
+
+    setup_example(idval, example_pha)
+    ap = ui.get_arf_plot(idval)
+    assert isinstance(ap, ARFPlot)
+
+
+@pytest.mark.parametrize("idval", [None, 1])
+def test_get_arf_plot(idval, clean_astro_ui, example_pha):
     """Basic testing of get_arf_plot
     """
 
-    setup_example(idval)
+    setup_example(idval, example_pha)
     if idval is None:
         ap = ui.get_arf_plot()
     else:
@@ -305,10 +411,10 @@ def test_get_arf_plot(idval, clean_astro_ui):
 
     assert isinstance(ap, ARFPlot)
 
-    assert ap.xlo == pytest.approx(_energies_lo)
-    assert ap.xhi == pytest.approx(_energies_hi)
+    assert_allclose(ap.xlo, _energies_lo)
+    assert_allclose(ap.xhi, _energies_hi)
 
-    assert ap.y == pytest.approx(_arf)
+    assert_allclose(ap.y, _arf)
 
     assert ap.title == 'test-arf'
     assert ap.xlabel == 'Energy (keV)'
@@ -317,12 +423,12 @@ def test_get_arf_plot(idval, clean_astro_ui):
     # assert ap.ylabel == 'cm$^2$'
 
 
-@pytest.mark.parametrize("idval", [None, 1, "one", 23])
-def test_get_bkg_plot(idval, clean_astro_ui):
+@pytest.mark.parametrize("idval", [None, 1])
+def test_get_bkg_plot(idval, clean_astro_ui, example_pha):
     """Basic testing of get_bkg_plot
     """
 
-    setup_example_bkg(idval)
+    setup_example_bkg(idval, example_pha)
     if idval is None:
         bp = ui.get_bkg_plot()
     else:
@@ -330,25 +436,24 @@ def test_get_bkg_plot(idval, clean_astro_ui):
 
     assert isinstance(bp, BkgDataPlot)
 
-    assert bp.x == pytest.approx(_data_chan)
+    assert_allclose(bp.x, _data_chan)
 
     # normalise by exposure time and bin width, but bin width here
     # is 1 (because it is being measured in channels).
     #
-    yexp = _data_bkg / (1201.0 * _bexpscale)
-    assert bp.y == pytest.approx(yexp)
+    assert_allclose(bp.y, _bkg_rate)
 
     assert bp.title == 'example-bkg'
     assert bp.xlabel == 'Channel'
     assert bp.ylabel == 'Counts/sec/channel'
 
 
-@pytest.mark.parametrize("idval", [None, 1, "one", 23])
-def test_get_bkg_plot_energy(idval, clean_astro_ui):
+@pytest.mark.parametrize("idval", [None, 1])
+def test_get_bkg_plot_energy(idval, clean_astro_ui, example_pha):
     """Basic testing of get_bkg_plot: energy
     """
 
-    setup_example_bkg(idval)
+    setup_example_bkg(idval, example_pha)
     if idval is None:
         ui.set_analysis('energy')
         bp = ui.get_bkg_plot()
@@ -356,40 +461,39 @@ def test_get_bkg_plot_energy(idval, clean_astro_ui):
         ui.set_analysis(idval, 'energy')
         bp = ui.get_bkg_plot(idval)
 
-    assert bp.x == pytest.approx(_energies_mid)
+    assert_allclose(bp.x, _energies_mid)
 
     # normalise by exposure time and bin width
     #
-    yexp = _data_bkg / (1201.0 * _bexpscale) / _energies_width
-    assert bp.y == pytest.approx(yexp)
+    assert_allclose(bp.y, _bkg_rate / _energies_width)
 
     assert bp.title == 'example-bkg'
     assert bp.xlabel == 'Energy (keV)'
     assert bp.ylabel == 'Counts/sec/keV'
 
 
-@pytest.mark.parametrize("idval", [None, 1, "one", 23])
-@pytest.mark.parametrize("gfunc", [ui.get_bkg_plot,
-                                   ui.get_bkg_model_plot,
-                                   ui.get_bkg_fit_plot])
-def test_get_bkg_plot_no_bkg(idval, gfunc, clean_astro_ui):
+@pytest.mark.parametrize("idval", [None, 1])
+@pytest.mark.parametrize("funcname", ["get_bkg_plot",
+                                      "get_bkg_model_plot",
+                                      "get_bkg_fit_plot"])
+def test_get_bkg_plot_no_bkg(idval, funcname, clean_astro_ui, example_pha):
     """Basic testing of get_bkg_XXX_plot when there's no background
     """
 
-    setup_example(idval)
+    setup_example(idval, example_pha)
     with pytest.raises(IdentifierErr):
         if idval is None:
-            gfunc()
+            getattr(ui, funcname)()
         else:
-            gfunc(idval)
+            getattr(ui, funcname)(idval)
 
 
-@pytest.mark.parametrize("idval", [None, 1, "one", 23])
-def test_get_model_plot(idval, clean_astro_ui):
+@pytest.mark.parametrize("idval", [None, 1])
+def test_get_model_plot(idval, clean_astro_ui, example_pha):
     """Basic testing of get_model_plot
     """
 
-    setup_example(idval)
+    setup_example(idval, example_pha)
     if idval is None:
         mp = ui.get_model_plot()
     else:
@@ -397,28 +501,27 @@ def test_get_model_plot(idval, clean_astro_ui):
 
     assert isinstance(mp, ModelHistogram)
 
-    assert mp.xlo == pytest.approx(_data_chan)
-    assert mp.xhi == pytest.approx(_data_chan + 1)
+    assert_allclose(mp.xlo, _data_chan)
+    assert_allclose(mp.xhi, _chan_hi)
 
     # The model is a constant, but integrated across the energy bin,
     # so the energy width is important here to get the normalization
     # right. It should also be divided by the channel width, but in
     # this case each bin has a channel width of 1.
     #
-    yexp = _arf * MODEL_NORM * _energies_width
-    assert mp.y == pytest.approx(yexp)
+    assert_allclose(mp.y, _model_y_chan)
 
     assert mp.title == 'Model'
     assert mp.xlabel == 'Channel'
     assert mp.ylabel == 'Counts/sec/channel'
 
 
-@pytest.mark.parametrize("idval", [None, 1, "one", 23])
-def test_get_model_plot_energy(idval, clean_astro_ui):
+@pytest.mark.parametrize("idval", [None, 1])
+def test_get_model_plot_energy(idval, clean_astro_ui, example_pha):
     """Basic testing of get_model_plot: energy
     """
 
-    setup_example(idval)
+    setup_example(idval, example_pha)
     if idval is None:
         ui.set_analysis('energy')
         mp = ui.get_model_plot()
@@ -426,36 +529,35 @@ def test_get_model_plot_energy(idval, clean_astro_ui):
         ui.set_analysis(idval, 'energy')
         mp = ui.get_model_plot(idval)
 
-    assert mp.xlo == pytest.approx(_energies_lo)
-    assert mp.xhi == pytest.approx(_energies_hi)
+    assert_allclose(mp.xlo, _energies_lo)
+    assert_allclose(mp.xhi, _energies_hi)
 
     # This should be normalized by the bin width, but it is cancelled
     # out by the fact that the model normalization has to be multiplied
     # by the bin width (both in energy).
     #
-    yexp = _arf * MODEL_NORM
-    assert mp.y == pytest.approx(yexp)
+    assert_allclose(mp.y, _model_y_energy)
 
     assert mp.title == 'Model'
     assert mp.xlabel == 'Energy (keV)'
     assert mp.ylabel == 'Counts/sec/keV'
 
 
-@pytest.mark.parametrize("idval", [None, 1, "one", 23])
-def test_get_source_plot_warning(idval, caplog, clean_astro_ui):
+@pytest.mark.parametrize("idval", [None, 1])
+def test_get_source_plot_warning(idval, caplog, clean_astro_ui, example_pha):
     """Does get_source_plot create a warning about channel space?
 
     This is a logged warning, not a UserWarning.
     """
 
-    setup_example(idval)
+    setup_example(idval, example_pha)
     if idval is None:
         ui.get_source_plot()
     else:
         ui.get_source_plot(idval)
 
-    emsg = 'Channel space is unappropriate for the PHA unfolded ' + \
-           'source model,\nusing energy.'
+    emsg = ('Channel space is unappropriate for the PHA unfolded '
+            'source model,\nusing energy.')
 
     assert len(caplog.record_tuples) == 1
     rec = caplog.record_tuples[0]
@@ -467,12 +569,12 @@ def test_get_source_plot_warning(idval, caplog, clean_astro_ui):
     assert msg == emsg
 
 
-@pytest.mark.parametrize("idval", [None, 1, "one", 23])
-def test_get_source_plot_energy(idval, clean_astro_ui):
+@pytest.mark.parametrize("idval", [None, 1])
+def test_get_source_plot_energy(idval, clean_astro_ui, example_pha):
     """Basic testing of get_source_plot: energy
     """
 
-    setup_example(idval)
+    setup_example(idval, example_pha)
     if idval is None:
         ui.set_analysis('energy')
         sp = ui.get_source_plot()
@@ -482,11 +584,11 @@ def test_get_source_plot_energy(idval, clean_astro_ui):
 
     assert isinstance(sp, SourcePlot)
 
-    assert sp.xlo == pytest.approx(_energies_lo)
-    assert sp.xhi == pytest.approx(_energies_hi)
+    assert_allclose(sp.xlo, _energies_lo)
+    assert_allclose(sp.xhi, _energies_hi)
 
     yexp = MODEL_NORM * np.ones(10)
-    assert sp.y == pytest.approx(yexp)
+    assert_allclose(sp.y, yexp)
 
     assert sp.title == 'Source Model of example'
     assert sp.xlabel == 'Energy (keV)'
@@ -495,9 +597,9 @@ def test_get_source_plot_energy(idval, clean_astro_ui):
     # assert sp.ylabel == 'f(E)  Photons/sec/cm$^2$/keV'
 
 
-@pytest.mark.parametrize("idval", [None, 1, "one", 23])
+@pytest.mark.parametrize("idval", [None, 1])
 @pytest.mark.parametrize("direct", [True, False])
-def test_get_bkg_model_plot(idval, direct, clean_astro_ui):
+def test_get_bkg_model_plot(idval, direct, clean_astro_ui, example_pha):
     """Basic testing of get_bkg_model_plot
 
     We test ui.set_bkg as well as datapha.set_background to check
@@ -507,26 +609,25 @@ def test_get_bkg_model_plot(idval, direct, clean_astro_ui):
     likely to be a common use case.
     """
 
-    setup_example_bkg_model(idval, direct=direct)
+    setup_example_bkg_model(idval, example_pha, direct=direct)
     if idval is None:
         bp = ui.get_bkg_model_plot()
     else:
         bp = ui.get_bkg_model_plot(idval)
 
-    assert bp.xlo == pytest.approx(_data_chan)
-    assert bp.xhi == pytest.approx(_data_chan + 1)
+    assert_allclose(bp.xlo, _data_chan)
+    assert_allclose(bp.xhi, _chan_hi)
 
-    yexp = _arf * BGND_NORM * _energies_width
-    assert bp.y == pytest.approx(yexp)
+    assert_allclose(bp.y, _bkg_model_y_chan)
 
     assert bp.title == 'Model'
     assert bp.xlabel == 'Channel'
     assert bp.ylabel == 'Counts/sec/channel'
 
 
-@pytest.mark.parametrize("idval", [None, 1, "one", 23])
+@pytest.mark.parametrize("idval", [None, 1])
 @pytest.mark.parametrize("direct", [True, False])
-def test_get_bkg_model_plot_energy(idval, direct, clean_astro_ui):
+def test_get_bkg_model_plot_energy(idval, direct, clean_astro_ui, example_pha):
     """Basic testing of get_bkg_model_plot: energy
 
     We test ui.set_bkg as well as datapha.set_background,
@@ -534,7 +635,7 @@ def test_get_bkg_model_plot_energy(idval, direct, clean_astro_ui):
     logic that set_bkg can do (issues #879 and #880)
     """
 
-    setup_example_bkg_model(idval, direct=direct)
+    setup_example_bkg_model(idval, example_pha, direct=direct)
     if idval is None:
         ui.set_analysis('energy')
         bp = ui.get_bkg_model_plot()
@@ -542,46 +643,42 @@ def test_get_bkg_model_plot_energy(idval, direct, clean_astro_ui):
         ui.set_analysis(idval, 'energy')
         bp = ui.get_bkg_model_plot(idval)
 
-    assert bp.xlo == pytest.approx(_energies_lo)
-    assert bp.xhi == pytest.approx(_energies_hi)
+    assert_allclose(bp.xlo, _energies_lo)
+    assert_allclose(bp.xhi, _energies_hi)
 
-    yexp = _arf * BGND_NORM
-    assert bp.y == pytest.approx(yexp)
+    assert_allclose(bp.y, _bkg_model_y_energy)
 
     assert bp.title == 'Model'
     assert bp.xlabel == 'Energy (keV)'
     assert bp.ylabel == 'Counts/sec/keV'
 
 
-@pytest.mark.parametrize("idval", [None, 1, "one", 23])
-def test_get_bkg_resid_plot(idval, clean_astro_ui):
+@pytest.mark.parametrize("idval", [None, 1])
+def test_get_bkg_resid_plot(idval, clean_astro_ui, example_pha):
     """Basic testing of get_bkg_resid_plot
     """
 
-    setup_example_bkg_model(idval)
+    setup_example_bkg_model(idval, example_pha)
     if idval is None:
         bp = ui.get_bkg_resid_plot()
     else:
         bp = ui.get_bkg_resid_plot(idval)
 
-    assert bp.x == pytest.approx(_data_chan)
+    assert_allclose(bp.x, _data_chan)
 
-    # correct the counts by the bin width and exposure time
-    #
-    yexp = _data_bkg / (1201.0 * _bexpscale) - _arf * BGND_NORM * _energies_width
-    assert bp.y == pytest.approx(yexp)
+    assert_allclose(bp.y, _bkg_resid_y_chan)
 
     assert bp.title == 'Residuals of example-bkg - Bkg Model'
     assert bp.xlabel == 'Channel'
     assert bp.ylabel == 'Counts/sec/channel'
 
 
-@pytest.mark.parametrize("idval", [None, 1, "one", 23])
-def test_get_bkg_resid_plot_energy(idval, clean_astro_ui):
+@pytest.mark.parametrize("idval", [None, 1])
+def test_get_bkg_resid_plot_energy(idval, clean_astro_ui, example_pha):
     """Basic testing of get_bkg_resid_plot: energy
     """
 
-    setup_example_bkg_model(idval)
+    setup_example_bkg_model(idval, example_pha)
     if idval is None:
         ui.set_analysis('energy')
         bp = ui.get_bkg_resid_plot()
@@ -589,24 +686,21 @@ def test_get_bkg_resid_plot_energy(idval, clean_astro_ui):
         ui.set_analysis(idval, 'energy')
         bp = ui.get_bkg_resid_plot(idval)
 
-    assert bp.x == pytest.approx(_energies_mid)
+    assert_allclose(bp.x, _energies_mid)
 
-    # correct the counts by the bin width and exposure time
-    #
-    yexp = _data_bkg / (1201.0 * _bexpscale * _energies_width) - _arf * BGND_NORM
-    assert bp.y == pytest.approx(yexp)
+    assert_allclose(bp.y, _bkg_resid_y_energy)
 
     assert bp.title == 'Residuals of example-bkg - Bkg Model'
     assert bp.xlabel == 'Energy (keV)'
     assert bp.ylabel == 'Counts/sec/keV'
 
 
-@pytest.mark.parametrize("idval", [None, 1, "one", 23])
-def test_get_bkg_fit_plot(idval, clean_astro_ui):
+@pytest.mark.parametrize("idval", [None, 1])
+def test_get_bkg_fit_plot(idval, clean_astro_ui, example_pha):
     """Basic testing of get_bkg_fit_plot
     """
 
-    setup_example_bkg_model(idval)
+    setup_example_bkg_model(idval, example_pha)
     if idval is None:
         fp = ui.get_bkg_fit_plot()
     else:
@@ -621,21 +715,19 @@ def test_get_bkg_fit_plot(idval, clean_astro_ui):
     for plot in [dp, mp]:
         assert plot.xlabel == 'Channel'
         assert plot.ylabel == 'Counts/sec/channel'
-        assert plot.x == pytest.approx(_data_chan)
+        assert_allclose(plot.x, _data_chan)
 
-    yexp = _data_bkg / (1201.0 * _bexpscale)
-    assert dp.y == pytest.approx(dp.y)
+    assert_allclose(dp.y, _bkg_rate)
 
-    yexp = _arf * BGND_NORM * _energies_width
-    assert mp.y == pytest.approx(yexp)
+    assert_allclose(mp.y, _bkg_model_y_chan)
 
 
-@pytest.mark.parametrize("idval", [None, 1, "one", 23])
-def test_get_bkg_fit_plot_energy(idval, clean_astro_ui):
+@pytest.mark.parametrize("idval", [None, 1])
+def test_get_bkg_fit_plot_energy(idval, clean_astro_ui, example_pha):
     """Basic testing of get_bkg_fit_plot: energy
     """
 
-    setup_example_bkg_model(idval)
+    setup_example_bkg_model(idval, example_pha)
     if idval is None:
         ui.set_analysis('energy')
         fp = ui.get_bkg_fit_plot()
@@ -652,13 +744,19 @@ def test_get_bkg_fit_plot_energy(idval, clean_astro_ui):
     for plot in [dp, mp]:
         assert plot.xlabel == 'Energy (keV)'
         assert plot.ylabel == 'Counts/sec/keV'
-        assert plot.x == pytest.approx(_energies_mid)
+        assert_allclose(plot.x, _energies_mid)
 
-    yexp = _data_bkg / (1201.0 * _bexpscale)
-    assert dp.y == pytest.approx(dp.y)
+    assert_allclose(dp.y, _bkg_rate / _energies_width)
 
-    yexp = _arf * BGND_NORM
-    assert mp.y == pytest.approx(yexp)
+    assert_allclose(mp.y, _bkg_model_y_energy)
+
+
+# The session attribute, title, and expected y values of the plots
+# that make up the background fit (channel space).
+#
+_bkg_fit_expected = [('_bkgdataplot', 'example-bkg', _bkg_rate),
+                     ('_bkgmodelplot', 'Background Model Contribution',
+                      _bkg_model_y_chan)]
 
 
 def check_bkg_fit(plotfunc):
@@ -668,9 +766,6 @@ def check_bkg_fit(plotfunc):
     (e.g. the pixel display/PNG output).
     """
 
-    dplot = ui._session._bkgdataplot
-    mplot = ui._session._bkgmodelplot
-
     # check the "source" plots are not set
     for plot in [ui._session._dataplot, ui._session._modelplot]:
         assert plot.x is None
@@ -678,21 +773,14 @@ def check_bkg_fit(plotfunc):
 
     xlabel = 'Channel' if plotfunc == ui.plot_bkg_fit else ''
 
-    # check plot basics
-    for plot in [dplot, mplot]:
+    for name, title, yexp in _bkg_fit_expected:
+        plot = getattr(ui._session, name)
+        assert plot.title == title
         assert plot.xlabel == xlabel
         assert plot.ylabel == 'Counts/sec/channel'
 
-        assert plot.x == pytest.approx(_data_chan)
-
-    assert dplot.title == 'example-bkg'
-    assert mplot.title == 'Background Model Contribution'
-
-    yexp = _data_bkg / (1201.0 * _bexpscale)
-    assert dplot.y == pytest.approx(yexp)
-
-    yexp = _arf * BGND_NORM * _energies_width
-    assert mplot.y == pytest.approx(yexp)
+        assert_allclose(plot.x, _data_chan)
+        assert_allclose(plot.y, yexp)
 
 
 def check_bkg_resid(plotfunc):
@@ -727,7 +815,7 @@ def check_bkg_resid(plotfunc):
     assert plot.ylabel != ''  # depends on the plot type
     assert plot.title == ''
 
-    assert plot.x == pytest.approx(_data_chan)
+    assert_allclose(plot.x, _data_chan)
     assert plot.y is not None
 
     # the way the data and model are constructed, all residual values
@@ -741,16 +829,16 @@ def check_bkg_resid(plotfunc):
 
 @requires_plotting
 @pytest.mark.usefixtures("clean_astro_ui")
-@pytest.mark.parametrize("idval", [None, 1, "one", 23])
+@pytest.mark.parametrize("idval", [None, 1])
 @pytest.mark.parametrize("plotfunc,checkfuncs",
                          [(ui.plot_bkg_fit, [check_bkg_fit]),
                           (ui.plot_bkg_fit_delchi, [check_bkg_fit, check_bkg_resid]),
                           (ui.plot_bkg_fit_ratio, [check_bkg_fit, check_bkg_resid]),
                           (ui.plot_bkg_fit_resid, [check_bkg_fit, check_bkg_resid])])
-def test_bkg_plot_xxx(idval, plotfunc, checkfuncs):
+def test_bkg_plot_xxx(idval, plotfunc, checkfuncs, example_pha):
     """Test background plotting - channel space"""
 
-    setup_example_bkg_model(idval)
+    setup_example_bkg_model(idval, example_pha)
     if idval is None:
         plotfunc()
     else:
@@ -769,12 +857,23 @@ def test_bkg_plot_xxx(idval, plotfunc, checkfuncs):
 # have been left separate.
 #
 
+@pytest.fixture(scope="session")
+def basic_pha1_data(make_data_path):
+    """The 3c273.pi dataset, with its responses and background.
+
+    The file is only read in once per session, so the dataset
+    must not be changed: basic_pha1 uses a copy.
+    """
+
+    return ui.unpack_pha(make_data_path('3c273.pi'))
+
+
 @pytest.fixture
-def basic_pha1(make_data_path):
+def basic_pha1(basic_pha1_data):
     """Create a basic PHA-1 data set/setup"""
 
     ui.set_default_id('tst')
-    ui.load_pha(make_data_path('3c273.pi'))
+    ui.set_data(copy.deepcopy(basic_pha1_data))
     ui.subtract()
     ui.notice(0.5, 7)
     ui.set_source(ui.powlaw1d.pl)
@@ -783,12 +882,23 @@ def basic_pha1(make_data_path):
     pl.ampl = 1.74e-4
 
 
+@pytest.fixture(scope="session")
+def basic_img_data(make_data_path):
+    """The img.fits dataset.
+
+    The file is only read in once per session, so the dataset
+    must not be changed: basic_img uses a copy.
+    """
+
+    return ui.unpack_image(make_data_path('img.fits'))
+
+
 @pytest.fixture
-def basic_img(make_data_path):
+def basic_img(basic_img_data):
     """Create a basic image data set/setup"""
 
     ui.set_default_id(2)
-    ui.load_image(make_data_path('img.fits'))
+    ui.set_data(copy.deepcopy(basic_img_data))
     ui.set_source(ui.gauss2d.gmdl)
     ui.guess()
 
@@ -876,15 +986,22 @@ def test_img_contour(clean_astro_ui, basic_img, plotfunc):
 # Add in some pylab-specific tests to change default values
 #
 
+def line_properties(line, names):
+    """Return the named properties of a matplotlib line.
+
+    The values are returned as a dictionary, keyed by name, where
+    the value of name is from line.get_<name>().
+    """
+
+    return {name: getattr(line, 'get_{}'.format(name))() for name in names}
+
+
 @requires_pylab
 @requires_fits
 @requires_data
 def test_pha1_plot_data_options(clean_astro_ui, basic_pha1):
     """Test that the options have changed things, where easy to do so"""
 
-    from matplotlib import pyplot as plt
-    import matplotlib
-
     prefs = ui.get_data_plot_prefs()
 
     # check the preference are as expected for the boolean cases
@@ -931,21 +1048,23 @@ def test_pha1_plot_data_options(clean_astro_ui, basic_pha1):
     assert ymin == pytest.approx(7.644069935298475e-05)
     assert ymax == pytest.approx(0.017031102671151491)
 
-    assert len(ax.lines) == 1
-    line = ax.lines[0]
+    lines = ax.lines
+    assert len(lines) == 1
+    line = lines[0]
 
     # Apparently color wins out over linecolor
-    assert line.get_color() == 'orange'
-    assert line.get_linestyle() == '-.'
-    assert line.get_marker() == 's'
-    assert line.get_markerfacecolor() == 'cyan'
+    props = line_properties(line, ['color', 'linestyle', 'marker',
+                                   'markerfacecolor'])
+    assert props == {'color': 'orange', 'linestyle': '-.',
+                     'marker': 's', 'markerfacecolor': 'cyan'}
     assert line.get_markersize() == pytest.approx(10.0)
 
     # assume error bars handled by a collection; test a subset
     # of values
     #
-    assert len(ax.collections) == 1
-    coll = ax.collections[0]
+    collections = ax.collections
+    assert len(collections) == 1
+    coll = collections[0]
 
     assert len(coll.get_segments()) == 42
 
@@ -954,7 +1073,7 @@ def test_pha1_plot_data_options(clean_astro_ui, basic_pha1):
     # not be tested?
     #
     expected = [(None, None)]
-    if matplotlib.__version__ >= '3.3.0':
+    if MPL_33:
         expected = [(0.0, None)]
 
     assert coll.get_linestyles() == expected
@@ -965,11 +1084,7 @@ def test_pha1_plot_data_options(clean_astro_ui, basic_pha1):
     colors = coll.get_color()
     assert len(colors) == 1
     assert len(colors[0]) == 4
-    r, g, b, a = colors[0]
-    assert r == pytest.approx(1)
-    assert g == pytest.approx(0.64705882)
-    assert b == pytest.approx(0)
-    assert a == pytest.approx(1)
+    assert_allclose(colors[0], ORANGE)
 
 
 @requires_pylab
@@ -989,8 +1104,6 @@ def test_pha1_plot_model_options(clean_astro_ui, basic_pha1):
 
     """
 
-    from matplotlib import pyplot as plt
-
     # Note that for PHA data sets, the mode is drawn as a histogram,
     # so get_model_plot_prefs doesn't actually work. We need to change
     # the histogram prefs instead. See issue
@@ -1039,14 +1152,16 @@ def test_pha1_plot_model_options(clean_astro_ui, basic_pha1):
     assert ymin == pytest.approx(-0.00045772936258082011, rel=0.01)
     assert ymax == pytest.approx(0.009940286575890335, rel=0.01)
 
-    assert len(ax.lines) == 1
-    line = ax.lines[0]
+    lines = ax.lines
+    assert len(lines) == 1
+    line = lines[0]
 
-    # Apparently color wins out over linecolor
-    assert line.get_color() == 'green'
-    assert line.get_linestyle() == '--'  # note: input was dashed
-    assert line.get_marker() == '*'
-    assert line.get_markerfacecolor() == 'yellow'
+    # Apparently color wins out over linecolor. Note that the input
+    # linestyle was dashed.
+    props = line_properties(line, ['color', 'linestyle', 'marker',
+                                   'markerfacecolor'])
+    assert props == {'color': 'green', 'linestyle': '--',
+                     'marker': '*', 'markerfacecolor': 'yellow'}
     assert line.get_markersize() == pytest.approx(8.0)
 
     assert len(ax.collections) == 0
@@ -1058,9 +1173,6 @@ def test_pha1_plot_model_options(clean_astro_ui, basic_pha1):
 def test_pha1_plot_fit_options(clean_astro_ui, basic_pha1):
     """Test that the options have changed things, where easy to do so"""
 
-    from matplotlib import pyplot as plt
-    import matplotlib
-
     dprefs = ui.get_data_plot_prefs()
     dprefs['xerrorbars'] = True
     dprefs['yerrorbars'] = False
@@ -1096,35 +1208,39 @@ def test_pha1_plot_fit_options(clean_astro_ui, basic_pha1):
     assert ymin == pytest.approx(7.644069935298475e-05)
     assert ymax == pytest.approx(0.017031102671151491)
 
-    assert len(ax.lines) == 2
+    lines = ax.lines
+    assert len(lines) == 2
 
     # DATA
     #
-    line = ax.lines[0]
+    line = lines[0]
 
     # Apparently color wins out over linecolor
-    assert line.get_color() == 'orange'
-    assert line.get_linestyle() == '-.'
-    assert line.get_marker() == 's'
-    assert line.get_markerfacecolor() == 'cyan'
-    assert line.get_markersize() == pytest.approx(10.0)
-    assert line.get_alpha() == pytest.approx(0.7)
+    props = line_properties(line, ['color', 'linestyle', 'marker',
+                                   'markerfacecolor'])
+    assert props == {'color': 'orange', 'linestyle': '-.',
+                     'marker': 's', 'markerfacecolor': 'cyan'}
+
+    props = line_properties(line, ['markersize', 'alpha'])
+    assert props == pytest.approx({'markersize': 10.0, 'alpha': 0.7})
 
     # MODEL
     #
-    line = ax.lines[1]
+    line = lines[1]
     assert line.get_color() != 'green'  # option over-ridden
     assert line.get_linestyle() == '-'  # option over-ridden
     assert line.get_marker() == 'None'
     assert line.get_markerfacecolor() == line.get_color()  # option over-ridden
-    assert line.get_markersize() == pytest.approx(6.0)
-    assert line.get_alpha() == pytest.approx(0.7)
+
+    props = line_properties(line, ['markersize', 'alpha'])
+    assert props == pytest.approx({'markersize': 6.0, 'alpha': 0.7})
 
     # assume error bars handled by a collection; test a subset
     # of values
     #
-    assert len(ax.collections) == 1
-    coll = ax.collections[0]
+    collections = ax.collections
+    assert len(collections) == 1
+    coll = collections[0]
 
     assert len(coll.get_segments()) == 42
 
@@ -1133,7 +1249,7 @@ def test_pha1_plot_fit_options(clean_astro_ui, basic_pha1):
     # not be tested?
     #
     expected = [(None, None)]
-    if matplotlib.__version__ >= '3.3.0':
+    if MPL_33:
         expected = [(0.0, None)]
 
     assert coll.get_linestyles() == expected
@@ -1144,11 +1260,7 @@ def test_pha1_plot_fit_options(clean_astro_ui, basic_pha1):
     colors = coll.get_color()
     assert len(colors) == 1
     assert len(colors[0]) == 4
-    r, g, b, a = colors[0]
-    assert r == pytest.approx(1)
-    assert g == pytest.approx(0.64705882)
-    assert b == pytest.approx(0)
-    assert a == pytest.approx(0.7)
+    assert_allclose(colors[0], ORANGE_ALPHA)
 
 
 @requires_pylab
@@ -1160,8 +1272,6 @@ def test_pha1_reg_proj(clean_astro_ui, basic_pha1):
     as much as possible.
     """
 
-    from matplotlib import pyplot as plt
-
     pl = ui.get_model_component("pl")
     ui.set_source(ui.xsphabs.gal * pl)
     gal = ui.get_model_component("gal")
@@ -1187,11 +1297,13 @@ def test_pha1_reg_proj(clean_astro_ui, basic_pha1):
     assert ymin == pytest.approx(0.0)
     assert ymax == pytest.approx(0.2)
 
-    assert len(ax.lines) == 1
-    line = ax.lines[0]
-    assert line.get_xdata().size == 1
+    lines = ax.lines
+    assert len(lines) == 1
+    line = lines[0]
+    xdata = line.get_xdata()
+    assert xdata.size == 1
 
-    x0 = line.get_xdata()[0]
+    x0 = xdata[0]
     y0 = line.get_ydata()[0]
 
     assert x0 == pytest.approx(pl.gamma.val)
@@ -1290,17 +1402,33 @@ def test_pha1_get_model_plot_filtered(clean_astro_ui, basic_pha1):
 
     assert mplot.y.size == 566
 
-    assert mplot.xlo[0] == pytest.approx(0.46720001101493835)
-    assert mplot.xhi[0] == pytest.approx(0.48179998993873596)
+    # Check the edges and the bins either side of the ignored range.
+    #
+    idx = [0, 100, 101, -1]
+    assert_allclose(mplot.xlo[idx],
+                    [0.46720001101493835, 1.9271999597549438,
+                     3.0806000232696533, 9.854999542236328], rtol=1e-6)
+    assert_allclose(mplot.xhi[idx],
+                    [0.48179998993873596, 1.9417999982833862,
+                     3.0952000617980957, 9.869600296020508], rtol=1e-6)
+
+
+# The fields of the model plot checked by test_bug920.
+ModelPlotFields = namedtuple('ModelPlotFields', 'xlo xhi y xlabel ylabel')
 
-    assert mplot.xlo[-1] == pytest.approx(9.854999542236328)
-    assert mplot.xhi[-1] == pytest.approx(9.869600296020508)
 
-    assert mplot.xlo[100] == pytest.approx(1.9271999597549438)
-    assert mplot.xhi[100] == pytest.approx(1.9417999982833862)
+def get_model_plot_fields():
+    """Copy the fields of the current model plot.
 
-    assert mplot.xlo[101] == pytest.approx(3.0806000232696533)
-    assert mplot.xhi[101] == pytest.approx(3.0952000617980957)
+    The model plot object is re-used by the UI layer, so the values
+    must be copied before it is re-created. Only the fields that are
+    checked are copied, which avoids a deepcopy of the plot object
+    (which includes the dataset and model).
+    """
+
+    mplot = ui.get_model_plot()
+    return ModelPlotFields(mplot.xlo.copy(), mplot.xhi.copy(),
+                           mplot.y.copy(), mplot.xlabel, mplot.ylabel)
 
 
 @requires_fits
@@ -1318,18 +1446,18 @@ def test_bug920(units, xlabel, ylabel, xlo, xhi, clean_astro_ui, basic_pha1):
     """
 
     assert ui.get_analysis() == 'energy'
-    mplot1 = copy.deepcopy(ui.get_model_plot())
+    mplot1 = get_model_plot_fields()
 
     ui.set_analysis(units)
     assert ui.get_analysis() == units
 
     # You need to create the model plot to trigger the bug.
-    mplot2 = copy.deepcopy(ui.get_model_plot())
+    mplot2 = get_model_plot_fields()
 
     ui.set_analysis('energy')
     assert ui.get_analysis() == 'energy'
 
-    mplot3 = copy.deepcopy(ui.get_model_plot())
+    mplot3 = get_model_plot_fields()
 
     assert mplot1.xlabel == 'Energy (keV)'
     assert mplot2.xlabel == xlabel
@@ -1340,11 +1468,10 @@ def test_bug920(units, xlabel, ylabel, xlo, xhi, clean_astro_ui, basic_pha1):
     assert mplot3.ylabel == 'Counts/sec/keV'
 
     # mplot3 should be the same as mplot1
-    assert mplot1.xlo[0] == pytest.approx(0.46720001101493835)
-    assert mplot1.xhi[-1] == pytest.approx(9.869600296020508)
+    assert_allclose([mplot1.xlo[0], mplot1.xhi[-1]],
+                    [0.46720001101493835, 9.869600296020508], rtol=1e-6)
 
-    assert mplot2.xlo[0] == pytest.approx(xlo)
-    assert mplot2.xhi[-1] == pytest.approx(xhi)
+    assert_allclose([mplot2.xlo[0], mplot2.xhi[-1]], [xlo, xhi], rtol=1e-6)
 
     assert mplot1.xlo.size == mplot1.y.size
     assert mplot2.xlo.size == mplot2.y.size
@@ -1356,8 +1483,8 @@ def test_bug920(units, xlabel, ylabel, xlo, xhi, clean_astro_ui, basic_pha1):
     assert mplot3.xlo.size == 644
 
     # This should be equality, but allow small differences
-    assert mplot3.xlo == pytest.approx(mplot1.xlo)
-    assert mplot3.y == pytest.approx(mplot1.y)
+    assert_allclose(mplot3.xlo, mplot1.xlo)
+    assert_allclose(mplot3.y, mplot1.y)
 
 
 def validate_flux_histogram(fhist):
@@ -1376,10 +1503,8 @@ def validate_flux_histogram(fhist):
 
     # Do the fluxes and the histogram agree?
     #
-    fmin = fhist.flux.min()
-    fmax = fhist.flux.max()
-    assert fmin == pytest.approx(fhist.xlo[0])
-    assert fmax == pytest.approx(fhist.xhi[-1])
+    assert_allclose([fhist.flux.min(), fhist.flux.max()],
+                    [fhist.xlo[0], fhist.xhi[-1]], rtol=1e-6)
 
 
 @requires_plotting
@@ -1389,12 +1514,12 @@ def validate_flux_histogram(fhist):
 @pytest.mark.parametrize("plotfunc,getfunc",
                          [(ui.plot_energy_flux, ui.get_energy_flux_hist),
                           (ui.plot_photon_flux, ui.get_photon_flux_hist)])
-@pytest.mark.parametrize("correlated", [False, True])
-def test_pha1_plot_foo_flux(plotfunc, getfunc, correlated, clean_astro_ui, basic_pha1):
+def test_pha1_plot_foo_flux(plotfunc, getfunc, clean_astro_ui, basic_pha1):
     """Can we call plot_energy/photon_flux and then the get_ func (recalc=False)
 
     We extend the basic_pha1 test by including an XSPEC
-    absorption model.
+    absorption model. The correlated and uncorrelated cases are
+    run in the same test so that the fit is only done once.
     """
 
     orig_mdl = ui.get_source('tst')
@@ -1409,13 +1534,15 @@ def test_pha1_plot_foo_flux(plotfunc, getfunc, correlated, clean_astro_ui, basic
     # of the results isn't important, so we can use a relatively-low
     # number of iterations.
     #
-    plotfunc(lo=0.5, hi=2, num=200, bins=20, correlated=correlated)
+    for correlated in [False, True]:
+        plotfunc(lo=0.5, hi=2, num=200, bins=20, correlated=correlated)
 
-    # check we can access these results (relying on the fact that the num
-    # and bins arguments have been changed from their default values).
-    #
-    res = getfunc(recalc=False)
-    validate_flux_histogram(res)
+        # check we can access these results (relying on the fact that
+        # the num and bins arguments have been changed from their
+        # default values).
+        #
+        res = getfunc(recalc=False)
+        validate_flux_histogram(res)
 
 
 @requires_plotting
@@ -1458,8 +1585,7 @@ def test_pha1_plot_foo_flux_recalc(plotfunc, getfunc, clean_astro_ui, basic_pha1
 @requires_xspec
 @pytest.mark.parametrize("getfunc", [ui.get_energy_flux_hist,
                                      ui.get_photon_flux_hist])
-@pytest.mark.parametrize("correlated", [False, True])
-def test_pha1_get_foo_flux_hist(getfunc, correlated, clean_astro_ui, basic_pha1):
+def test_pha1_get_foo_flux_hist(getfunc, clean_astro_ui, basic_pha1):
     """Can we call get_energy/photon_flux_hist?
 
     See test_pha1_plot_foo_flux.
@@ -1477,8 +1603,9 @@ def test_pha1_get_foo_flux_hist(getfunc, correlated, clean_astro_ui, basic_pha1)
     # of the results isn't important, so we can use a relatively-low
     # number of iterations.
     #
-    res = getfunc(lo=0.5, hi=2, num=200, bins=20, correlated=correlated)
-    validate_flux_histogram(res)
+    for correlated in [False, True]:
+        res = getfunc(lo=0.5, hi=2, num=200, bins=20, correlated=correlated)
+        validate_flux_histogram(res)
 
 
 @requires_plotting
@@ -1645,8 +1772,6 @@ def test_pha1_plot_foo_flux_model(plotfunc, getfunc, ratio,
     # Ensure near the minimum
     ui.fit()
     ui.covar()
-    covmat = ui.get_covar_results().extra_output
-    errs = np.sqrt(covmat.diagonal())
 
     # Due to the way the get* routines work in the sherpa.astro.ui module,
     # the following will return the same object, so x1 and x2 will be
@@ -1709,16 +1834,14 @@ def test_pha1_plot_foo_flux_model(plotfunc, getfunc, ratio,
 @requires_fits
 @requires_data
 @requires_xspec
-@pytest.mark.parametrize("plotfunc,getfunc",
-                         [(ui.plot_energy_flux, ui.get_energy_flux_hist),
-                          (ui.plot_photon_flux, ui.get_photon_flux_hist)])
-def test_pha1_plot_foo_flux_multi(plotfunc, getfunc,
-                                  make_data_path, clean_astro_ui,
+def test_pha1_plot_foo_flux_multi(make_data_path, clean_astro_ui,
                                   hide_logging, reset_seed):
     """Can we call plot_energy/photon_flux with multiple datasets.
-    """
 
-    np.random.seed(7267239)
+    The energy and photon versions are run in the same test so that
+    the data only has to be loaded and fit once. The seed is reset
+    for each version so that they use the same parameter samples.
+    """
 
     ui.load_pha(1, make_data_path('obs1.pi'))
     ui.load_pha(3, make_data_path('obs1.pi'))
@@ -1743,40 +1866,45 @@ def test_pha1_plot_foo_flux_multi(plotfunc, getfunc,
 
     n = 200
 
-    # Use all datasets since id=None
-    plotfunc(lo=0.5, hi=7, num=n, bins=19, correlated=False)
-    res = getfunc(recalc=False)
-    assert res.y.shape == (20,)
-    avals = res.modelvals.copy()
+    for plotfunc, getfunc in [(ui.plot_energy_flux, ui.get_energy_flux_hist),
+                              (ui.plot_photon_flux, ui.get_photon_flux_hist)]:
 
-    # Use all datasets as explicit
-    plotfunc(lo=0.5, hi=7, num=n, bins=19, correlated=False,
-             id=1, otherids=(3,))
-    res = getfunc(recalc=False)
-    assert res.y.shape == (20,)
-    bvals = res.modelvals.copy()
+        np.random.seed(7267239)
 
-    # Use only dataset 1 (the shorter dataset)
-    plotfunc(lo=0.5, hi=7, num=n, bins=19, correlated=False,
-             id=1)
-    res = getfunc(recalc=False)
-    assert res.y.shape == (20,)
-    cvals = res.modelvals.copy()
+        # Use all datasets since id=None
+        plotfunc(lo=0.5, hi=7, num=n, bins=19, correlated=False)
+        res = getfunc(recalc=False)
+        assert res.y.shape == (20,)
+        avals = res.modelvals.copy()
 
-    assert avals.shape == (n, 2)
-    assert bvals.shape == (n, 2)
-    assert cvals.shape == (n, 2)
+        # Use all datasets as explicit
+        plotfunc(lo=0.5, hi=7, num=n, bins=19, correlated=False,
+                 id=1, otherids=(3,))
+        res = getfunc(recalc=False)
+        assert res.y.shape == (20,)
+        bvals = res.modelvals.copy()
 
-    # Let's just check the standard deviation of the gamma parameter,
-    # which should be similar for avals and bvals, and larger for cvals.
-    #
-    s1 = np.std(avals[:, 0])
-    s2 = np.std(bvals[:, 0])
-    s3 = np.std(cvals[:, 0])
+        # Use only dataset 1 (the shorter dataset)
+        plotfunc(lo=0.5, hi=7, num=n, bins=19, correlated=False,
+                 id=1)
+        res = getfunc(recalc=False)
+        assert res.y.shape == (20,)
+        cvals = res.modelvals.copy()
+
+        assert avals.shape == (n, 2)
+        assert bvals.shape == (n, 2)
+        assert cvals.shape == (n, 2)
 
-    assert s1 == pytest.approx(0.1774218722298197)
-    assert s2 == pytest.approx(0.1688597911809269)
-    assert s3 == pytest.approx(0.22703663059917598)
+        # Let's just check the standard deviation of the gamma parameter,
+        # which should be similar for avals and bvals, and larger for cvals.
+        #
+        s1 = np.std(avals[:, 0])
+        s2 = np.std(bvals[:, 0])
+        s3 = np.std(cvals[:, 0])
+
+        assert s1 == pytest.approx(0.1774218722298197)
+        assert s2 == pytest.approx(0.1688597911809269)
+        assert s3 == pytest.approx(0.22703663059917598)
 
 
 @requires_plotting
@@ -1807,8 +1935,6 @@ def test_pha1_get_foo_flux_hist_model(getfunc, ratio,
     # Ensure near the minimum
     ui.fit()
     ui.covar()
-    covmat = ui.get_covar_results().extra_output
-    errs = np.sqrt(covmat.diagonal())
 
     # See commentary in test_pha1_plot_foo_flux_model about the
     # potentially-surprising behavior of the return value of the
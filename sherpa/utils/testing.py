@@ -17,6 +17,7 @@
 #  51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 #
 
+from functools import lru_cache
 import numpy
 import unittest
 import os
@@ -160,9 +161,14 @@ class SherpaTestCase(unittest.TestCase):
             os.chdir(cwd)
 
 
+@lru_cache(maxsize=None)
 def has_package_from_list(*packages):
     """
     Returns True if at least one of the ``packages`` args is importable.
+
+    The result is cached, since the requires_xxx decorators call this
+    for every decorated test, and a failed import is not cached by
+    Python.
     """
     for package in packages:
         try: